@@ -1,20 +1,17 @@
 # batch_score.py
 
-import csv
 import datetime
-from stock_analysis import analyze_and_score
-
-# 5-day and 20-day parameter sets (must match what's in stock_analysis.py)
-params5 = {
-    "sma_short": 3,  "sma_long": 5,
-    "bb_window": 5,  "rsi_window": 5,
-    "macd_fast": 3,  "macd_slow": 8,  "macd_signal": 3,
-}
-params20 = {
-    "sma_short": 10, "sma_long": 20,
-    "bb_window": 20, "rsi_window": 14,
-    "macd_fast": 12, "macd_slow": 26, "macd_signal": 9,
-}
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from stock_analysis import (
+    calculate_indicators_many, compute_score, fetch_fundamentals, fetch_many, history_start,
+    params5, params20,
+)
+
+# Price history for all tickers comes from one batched download; what's left
+# per ticker is the fundamentals request, so a thread pool lets those
+# overlap while sharing fetch_fundamentals' cache.
+MAX_WORKERS = 16
 
 def main():
     # as_of must be a datetime so that pd.Timedelta subtraction works
@@ -24,24 +21,43 @@ def main():
     with open('tickers.txt') as f:
         tickers = [line.strip() for line in f if line.strip()]
 
-    results = []
+    start = min(history_start(as_of, 5, params5), history_start(as_of, 20, params20))
+    end   = as_of.strftime("%Y-%m-%d")
+    histories = fetch_many(tickers, start, end)
     for ticker in tickers:
-        try:
-            score_5  = analyze_and_score(ticker, as_of, lookback_days=5,  params=params5)
-            score_20 = analyze_and_score(ticker, as_of, lookback_days=20, params=params20)
-            results.append({
-                'ticker':    ticker,
-                'score_5':   score_5,
-                'score_20':  score_20,
-            })
-        except Exception as e:
-            print(f"Error scoring {ticker}: {e}")
+        if ticker not in histories:
+            print(f"Error scoring {ticker}: No data returned for {ticker}.")
+
+    funds = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        futures = {ex.submit(fetch_fundamentals, t): t for t in histories}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                funds[ticker] = future.result()
+            except Exception as e:
+                print(f"Error scoring {ticker}: {e}")
+
+    # The history covers the longest window either parameter set needs; slice
+    # it per lookback and compute every ticker's indicators in one batch
+    scored = {t: {'ticker': t} for t in funds}
+    for key, lookback_days, params in (('score_5', 5, params5), ('score_20', 20, params20)):
+        start  = history_start(as_of, lookback_days, params)
+        frames = calculate_indicators_many({t: histories[t].loc[start:] for t in scored}, **params)
+        for ticker, df in frames.items():
+            try:
+                scored[ticker][key] = compute_score(df, funds[ticker], lookback_days)
+            except Exception as e:
+                print(f"Error scoring {ticker}: {e}")
+                del scored[ticker]
+
+    # Keep the output in tickers.txt order
+    results = [scored[t] for t in tickers if t in scored]
 
     # Dump everything to CSV
-    with open('results.csv', 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=['ticker','score_5','score_20'])
-        writer.writeheader()
-        writer.writerows(results)
+    pd.DataFrame(results, columns=['ticker','score_5','score_20']).to_csv(
+        'results.csv', index=False, lineterminator='\r\n',
+    )
 
     # Print best performers if any succeeded
     if results:
@@ -2,18 +2,148 @@
 """Utilities for downloading stock data and computing both 5-day and 20-day scores using yfinance."""
 
 from __future__ import annotations
+import os
+import re
+import tempfile
 import pandas as pd
 import numpy as np
 import yfinance as yf
 from functools import lru_cache
-from typing import Dict
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import datetime, date
+from pathlib import Path
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the kernels below still run as plain Python
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+__all__ = [
+    "DownloadError",
+    "params5",
+    "params20",
+    "fetch_data",
+    "fetch_many",
+    "calculate_indicators",
+    "calculate_indicators_many",
+    "fetch_fundamentals",
+    "compute_score",
+    "history_start",
+    "score_from_df",
+    "analyze_and_score",
+]
+
+# 5-day and 20-day parameter sets, shared by the CLI below and batch_score.py
+params5 = {
+    "sma_short": 3,  "sma_long": 5,
+    "bb_window": 5,  "rsi_window": 5,
+    "macd_fast": 3,  "macd_slow": 8,  "macd_signal": 3,
+}
+params20 = {
+    "sma_short": 10, "sma_long": 20,
+    "bb_window": 20, "rsi_window": 14,
+    "macd_fast": 12, "macd_slow": 26, "macd_signal": 9,
+}
 
 class DownloadError(Exception):
     """Raised when data download fails."""
     pass
 
+# Downloaded price history is cached as parquet so reruns on the same day
+# skip the network; set STOCK_ANALYSIS_CACHE to move the cache directory.
+CACHE_DIR = Path(os.getenv("STOCK_ANALYSIS_CACHE", Path.home() / ".cache" / "stock_analysis"))
+# files are only ever written to, and pruned from, this subdirectory
+_PRICE_DIR = CACHE_DIR / "prices"
+_CACHE_NAME = re.compile(r".+_\d{4}-\d{2}-\d{2}_\d{4}-\d{2}-\d{2}\.parquet")
+_TMP_NAME   = re.compile(r".+_\d{4}-\d{2}-\d{2}_\d{4}-\d{2}-\d{2}\.[^.]+\.parquet\.tmp")
+
+# mkstemp creates files as 0600; cache files should follow the umask instead.
+# Read once at import, since os.umask can only be queried by setting it.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _cache_path(ticker: str, start: str, end: str) -> Path:
+    return _PRICE_DIR / f"{ticker.replace('/', '-')}_{start}_{end}.parquet"
+
+def _is_today(path: Path) -> bool:
+    return date.fromtimestamp(path.stat().st_mtime) == date.today()
+
+def _read_cache(ticker: str, start: str, end: str) -> Optional[pd.DataFrame]:
+    path = _cache_path(ticker, start, end)
+    try:
+        if not _is_today(path):
+            return None
+    except OSError:
+        return None  # not cached yet
+    try:
+        return pd.read_parquet(path)
+    except ImportError:
+        return None  # no parquet engine installed
+    except (OSError, ValueError):
+        # truncated or otherwise unreadable: drop it so it gets re-downloaded
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        return None
+
+_pruned_on: Optional[date] = None
+
+def _prune_cache() -> None:
+    # Keys include the end date, so files from earlier days are never read again
+    global _pruned_on
+    if _pruned_on == date.today():
+        return
+    _pruned_on = date.today()
+    for path in _PRICE_DIR.iterdir():
+        if not (_CACHE_NAME.fullmatch(path.name) or _TMP_NAME.fullmatch(path.name)):
+            continue
+        try:
+            if not _is_today(path):
+                path.unlink()
+        except OSError:
+            pass
+
+def _write_cache(df: pd.DataFrame, ticker: str, start: str, end: str) -> None:
+    path = _cache_path(ticker, start, end)
+    tmp  = None
+    try:
+        _PRICE_DIR.mkdir(parents=True, exist_ok=True)
+        _prune_cache()
+        # write to a private temp file and rename it into place, so readers
+        # never see a partial file and concurrent writers don't interleave
+        fd, tmp = tempfile.mkstemp(dir=_PRICE_DIR, prefix=path.stem + ".", suffix=".parquet.tmp")
+        os.close(fd)
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+        tmp = None
+    except (OSError, ImportError):
+        pass  # caching is best-effort
+    finally:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+def _ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.rename_axis("Date").loc[:, ["Open","High","Low","Close","Volume"]]
+    # yfinance already hands back a DatetimeIndex; only parse anything else
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
+    return df
+
 def fetch_data(ticker: str, start: str, end: str) -> pd.DataFrame:
+    df = _read_cache(ticker, start, end)
+    if df is not None:
+        return df
+
     df = yf.download(
         ticker,
         start=start,
@@ -27,10 +157,253 @@ def fetch_data(ticker: str, start: str, end: str) -> pd.DataFrame:
     if isinstance(df.columns, pd.MultiIndex):
         # level 0 is the OHLCV+indicator names, level 1 is the ticker
         df.columns = df.columns.droplevel(1)
-    df = df.rename_axis("Date").loc[:, ["Open","High","Low","Close","Volume"]]
-    df.index = pd.to_datetime(df.index)
+    df = _ohlcv(df)
+    _write_cache(df, ticker, start, end)
     return df
 
+def fetch_many(tickers: List[str], start: str, end: str) -> Dict[str, pd.DataFrame]:
+    """Fetch several tickers at once; everything not cached comes from one batched download.
+
+    Tickers that return no data are left out of the result.
+    """
+    out: Dict[str, pd.DataFrame] = {}
+    missing = []
+    for ticker in tickers:
+        df = _read_cache(ticker, start, end)
+        if df is not None:
+            out[ticker] = df
+        else:
+            missing.append(ticker)
+    if not missing:
+        return out
+
+    raw = yf.download(
+        missing,
+        start=start,
+        end=end,
+        progress=False,
+        auto_adjust=False,
+        group_by="ticker",
+    )
+    if raw.empty:
+        return out
+    for ticker in missing:
+        # yf.download upper-cases symbols in its result
+        symbol = ticker.upper()
+        if symbol not in raw.columns.get_level_values(0):
+            continue
+        # the combined frame spans every ticker's dates; drop the ones this ticker didn't trade
+        df = _ohlcv(raw[symbol]).dropna(how="all")
+        if df.empty:
+            continue
+        _write_cache(df, ticker, start, end)
+        out[ticker] = df
+    return out
+
+
+# Indicators are computed in a single pass over the bars by numba kernels.
+# Each step function matches one step of the equivalent pandas rolling/ewm
+# call, including its NaN handling; error_model="numpy" makes 0/0 give NaN.
+
+@njit(cache=True, error_model="numpy")
+def _window_sum_step(s, nans, x, t, window):
+    # Slide a running sum over x so it ends at t: add the value entering the
+    # window and subtract the one leaving it. NaNs are counted, not summed;
+    # like Series.rolling(window).mean(), the window is only valid with none.
+    if t >= window:
+        old = x[t - window]
+        if old == old:
+            s -= old
+        else:
+            nans -= 1
+    v = x[t]
+    if v == v:
+        s += v
+    else:
+        nans += 1
+    return s, nans
+
+@njit(cache=True, error_model="numpy")
+def _window_var_step(nobs, mean, m2, nans, x, t, window):
+    # Welford add/remove update of the window's mean and sum of squared
+    # deviations; a sum-of-squares shortcut would cancel badly at price scale
+    # and report a tiny non-zero width for flat windows
+    if t >= window:
+        old = x[t - window]
+        if old == old:
+            nobs -= 1
+            if nobs == 0:
+                mean = 0.0
+                m2   = 0.0
+            else:
+                delta = old - mean
+                mean -= delta / nobs
+                m2   -= delta * (old - mean)
+        else:
+            nans -= 1
+    v = x[t]
+    if v == v:
+        nobs  += 1
+        delta  = v - mean
+        mean  += delta / nobs
+        m2    += delta * (v - mean)
+    else:
+        nans += 1
+    return nobs, mean, m2, nans
+
+@njit(cache=True, error_model="numpy")
+def _ema_step(y, decay, v, alpha):
+    # One step of Series.ewm(adjust=False).mean() as the plain recurrence
+    # y += alpha * (v - y). Leading NaNs stay NaN; an interior NaN repeats
+    # the last value, and the next observation is blended with the value's
+    # decayed weight as pandas (>= 3) does, including its com == 1 (span=3)
+    # case where the new value takes the remaining 1 - decay weight
+    if y != y:
+        y = v
+    elif v != v:
+        decay *= 1.0 - alpha
+    elif decay == 1.0:
+        y += alpha * (v - y)
+    else:
+        decay *= 1.0 - alpha
+        if v != y:
+            new_wt = 1.0 - decay if alpha == 0.5 else alpha
+            y = (decay * y + new_wt * v) / (decay + new_wt)
+        decay = 1.0
+    return y, decay
+
+@njit(cache=True, error_model="numpy")
+def _indicators_njit(close, high, low, volume,
+                     sma_s, sma_l, bb, rsi_w, m_fast, m_slow, m_sig):
+    n = close.shape[0]
+
+    sma_short   = np.full(n, np.nan)
+    sma_long    = np.full(n, np.nan)
+    bb_upper    = np.full(n, np.nan)
+    bb_lower    = np.full(n, np.nan)
+    atr         = np.full(n, np.nan)
+    adx         = np.empty(n)
+    rsi         = np.full(n, np.nan)
+    macd        = np.empty(n)
+    macd_signal = np.empty(n)
+    obv         = np.empty(n)
+    # per-bar inputs of the ATR/RSI windows, kept so values can leave the window
+    tr   = np.empty(n)
+    gain = np.empty(n)
+    loss = np.empty(n)
+
+    a_bb   = 2.0 / (bb + 1.0)
+    a_fast = 2.0 / (m_fast + 1.0)
+    a_slow = 2.0 / (m_slow + 1.0)
+    a_sig  = 2.0 / (m_sig + 1.0)
+
+    s_short = 0.0; nan_short = 0
+    s_long  = 0.0; nan_long  = 0
+    bb_nobs = 0; bb_mean = 0.0; bb_m2 = 0.0; nan_bb = 0; same = 0
+    s_tr    = 0.0; nan_tr    = 0
+    s_gain  = 0.0; nan_gain  = 0
+    s_loss  = 0.0; nan_loss  = 0
+    ema_plus  = np.nan; d_plus  = 1.0
+    ema_minus = np.nan; d_minus = 1.0
+    ema_dx    = np.nan; d_dx    = 1.0
+    ema_fast  = np.nan; d_fast  = 1.0
+    ema_slow  = np.nan; d_slow  = 1.0
+    ema_sig   = np.nan; d_sig   = 1.0
+
+    for t in range(n):
+        c = close[t]
+
+        # Moving averages
+        s_short, nan_short = _window_sum_step(s_short, nan_short, close, t, sma_s)
+        if t >= sma_s - 1 and nan_short == 0:
+            sma_short[t] = s_short / sma_s
+        s_long, nan_long = _window_sum_step(s_long, nan_long, close, t, sma_l)
+        if t >= sma_l - 1 and nan_long == 0:
+            sma_long[t] = s_long / sma_l
+
+        # Bollinger Bands (std with ddof=1, exactly 0 for identical values)
+        bb_nobs, bb_mean, bb_m2, nan_bb = _window_var_step(
+            bb_nobs, bb_mean, bb_m2, nan_bb, close, t, bb)
+        same = same + 1 if t > 0 and c == close[t - 1] else 1
+        if bb >= 2 and t >= bb - 1 and nan_bb == 0:
+            sd = 0.0 if same >= bb else np.sqrt(max(bb_m2, 0.0) / (bb - 1))
+            bb_upper[t] = bb_mean + 2 * sd
+            bb_lower[t] = bb_mean - 2 * sd
+
+        # ATR (the first bar has no previous close, so TR is just high - low)
+        tr[t] = high[t] - low[t]
+        if t > 0:
+            tr[t] = max(tr[t], abs(high[t] - close[t - 1]), abs(low[t] - close[t - 1]))
+        s_tr, nan_tr = _window_sum_step(s_tr, nan_tr, tr, t, bb)
+        if t >= bb - 1 and nan_tr == 0:
+            atr[t] = s_tr / bb
+
+        # ADX
+        plus_dm  = 0.0
+        minus_dm = 0.0
+        if t > 0:
+            high_diff = high[t] - high[t - 1]
+            low_diff  = low[t]  - low[t - 1]
+            if high_diff > low_diff and high_diff > 0:
+                plus_dm = high_diff
+            if low_diff > high_diff and low_diff > 0:
+                minus_dm = low_diff
+        ema_plus,  d_plus  = _ema_step(ema_plus,  d_plus,  plus_dm,  a_bb)
+        ema_minus, d_minus = _ema_step(ema_minus, d_minus, minus_dm, a_bb)
+        plus_di  = 100 * ema_plus  / atr[t]
+        minus_di = 100 * ema_minus / atr[t]
+        dx       = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+        ema_dx, d_dx = _ema_step(ema_dx, d_dx, dx, a_bb)
+        adx[t] = ema_dx
+
+        # RSI
+        gain[t] = 0.0
+        loss[t] = 0.0
+        if t > 0:
+            delta = c - close[t - 1]
+            if delta > 0:
+                gain[t] = delta
+            elif delta < 0:
+                loss[t] = -delta
+        s_gain, nan_gain = _window_sum_step(s_gain, nan_gain, gain, t, rsi_w)
+        s_loss, nan_loss = _window_sum_step(s_loss, nan_loss, loss, t, rsi_w)
+        if t >= rsi_w - 1:
+            rsi[t] = 100 - (100 / (1 + (s_gain / rsi_w) / (s_loss / rsi_w)))
+
+        # MACD
+        ema_fast, d_fast = _ema_step(ema_fast, d_fast, c, a_fast)
+        ema_slow, d_slow = _ema_step(ema_slow, d_slow, c, a_slow)
+        macd[t] = ema_fast - ema_slow
+        ema_sig, d_sig = _ema_step(ema_sig, d_sig, macd[t], a_sig)
+        macd_signal[t] = ema_sig
+
+        # OBV (a missing close contributes no volume, like diff().fillna(0))
+        obv[t] = 0.0
+        if t > 0:
+            obv[t] = obv[t - 1]
+            if c == c and close[t - 1] == close[t - 1]:
+                obv[t] += np.sign(c - close[t - 1]) * volume[t]
+
+    return (sma_short, sma_long, bb_upper, bb_lower, atr, adx,
+            rsi, macd, macd_signal, obv)
+
+_INDICATOR_COLUMNS = (
+    "SMA_short", "SMA_long", "BB_upper", "BB_lower", "ATR", "ADX",
+    "RSI", "MACD", "MACD_signal", "OBV",
+)
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def _batch_indicators_njit(close, high, low, volume,
+                           sma_s, sma_l, bb, rsi_w, m_fast, m_slow, m_sig):
+    # Rows are tickers; each one is independent, so they're spread over cores
+    n_tickers, n = close.shape
+    out = np.empty((len(_INDICATOR_COLUMNS), n_tickers, n))
+    for i in prange(n_tickers):
+        cols = _indicators_njit(close[i], high[i], low[i], volume[i],
+                                sma_s, sma_l, bb, rsi_w, m_fast, m_slow, m_sig)
+        for k in range(len(cols)):
+            out[k, i] = cols[k]
+    return out
 
 def calculate_indicators(
     df: pd.DataFrame,
@@ -42,58 +415,59 @@ def calculate_indicators(
     macd_slow: int,
     macd_signal: int,
 ) -> pd.DataFrame:
-    df = df.copy()
-
-    # Moving averages
-    df["SMA_short"] = df["Close"].rolling(window=sma_short).mean()
-    df["SMA_long"]  = df["Close"].rolling(window=sma_long).mean()
-
-    # Bollinger Bands
-    m = df["Close"].rolling(window=bb_window).mean()
-    s = df["Close"].rolling(window=bb_window).std()
-    df["BB_upper"] = m + 2 * s
-    df["BB_lower"] = m - 2 * s
-
-    # ATR
-    hl = df["High"] - df["Low"]
-    hc = (df["High"] - df["Close"].shift()).abs()
-    lc = (df["Low"]  - df["Close"].shift()).abs()
-    tr = pd.concat([hl, hc, lc], axis=1).max(axis=1)
-    df["ATR"] = tr.rolling(window=bb_window).mean()
-
-    # ADX
-    high_diff = df["High"].diff()
-    low_diff  = df["Low"].diff()
-    plus_dm   = high_diff.where((high_diff > low_diff) & (high_diff > 0), 0.0)
-    minus_dm  = low_diff.where((low_diff > high_diff) & (low_diff > 0), 0.0)
-
-    atr = df["ATR"]
-    plus_di  = 100 * plus_dm.ewm(span=bb_window, adjust=False).mean() / atr
-    minus_di = 100 * minus_dm.ewm(span=bb_window, adjust=False).mean() / atr
-    dx       = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
-
-    adx = dx.ewm(span=bb_window, adjust=False).mean()
-    # if it's ever a 1-col DataFrame, pull out that column
-    if isinstance(adx, pd.DataFrame):
-        adx = adx.iloc[:, 0]
-    df["ADX"] = adx
-
-    # RSI
-    delta = df["Close"].diff()
-    gain  = delta.where(delta > 0, 0).rolling(window=rsi_window).mean()
-    loss  = -delta.where(delta < 0, 0).rolling(window=rsi_window).mean()
-    df["RSI"] = 100 - (100 / (1 + gain / loss))
-
-    # MACD
-    fast = df["Close"].ewm(span=macd_fast, adjust=False).mean()
-    slow = df["Close"].ewm(span=macd_slow, adjust=False).mean()
-    df["MACD"]        = fast - slow
-    df["MACD_signal"] = df["MACD"].ewm(span=macd_signal, adjust=False).mean()
-
-    # OBV
-    df["OBV"] = (np.sign(df["Close"].diff().fillna(0)) * df["Volume"]).cumsum()
-
-    return df
+    close  = df["Close"].to_numpy(dtype=np.float64)
+    high   = df["High"].to_numpy(dtype=np.float64)
+    low    = df["Low"].to_numpy(dtype=np.float64)
+    volume = df["Volume"].to_numpy(dtype=np.float64)
+
+    # Only matters without numba, where 0/0 goes through numpy and warns
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cols = _indicators_njit(
+            close, high, low, volume,
+            sma_short, sma_long, bb_window, rsi_window,
+            macd_fast, macd_slow, macd_signal,
+        )
+    # returns a new frame; callers may share df between parameter sets
+    indicators = pd.DataFrame(dict(zip(_INDICATOR_COLUMNS, cols)), index=df.index)
+    return pd.concat([df, indicators], axis=1)
+
+def calculate_indicators_many(
+    frames: Dict[str, pd.DataFrame],
+    sma_short: int,
+    sma_long: int,
+    bb_window: int,
+    rsi_window: int,
+    macd_fast: int,
+    macd_slow: int,
+    macd_signal: int,
+) -> Dict[str, pd.DataFrame]:
+    """calculate_indicators for many tickers at once.
+
+    Frames that share a date index are stacked into (tickers, days) arrays and
+    go through one parallel kernel call; the results match calculate_indicators.
+    """
+    groups: Dict[tuple, List[str]] = {}
+    for ticker, df in frames.items():
+        key = (str(df.index.dtype), df.index.to_numpy().tobytes())
+        groups.setdefault(key, []).append(ticker)
+
+    out: Dict[str, pd.DataFrame] = {}
+    for members in groups.values():
+        close, high, low, volume = (
+            np.stack([frames[t][col].to_numpy(dtype=np.float64) for t in members])
+            for col in ("Close", "High", "Low", "Volume")
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cols = _batch_indicators_njit(
+                close, high, low, volume,
+                sma_short, sma_long, bb_window, rsi_window,
+                macd_fast, macd_slow, macd_signal,
+            )
+        for i, ticker in enumerate(members):
+            df = frames[ticker]
+            indicators = pd.DataFrame(dict(zip(_INDICATOR_COLUMNS, cols[:, i])), index=df.index)
+            out[ticker] = pd.concat([df, indicators], axis=1)
+    return {ticker: out[ticker] for ticker in frames}
 
 @lru_cache(maxsize=None)
 def fetch_fundamentals(ticker: str) -> Dict[str, float]:
@@ -110,6 +484,13 @@ def fetch_fundamentals(ticker: str) -> Dict[str, float]:
         out["debtToEquity"] = float(de)
     return out
 
+# Fundamental scoring curves for compute_score: np.interp breakpoints (xp)
+# and the points they map to (fp)
+_PE_XP, _PE_FP = np.array([5, 15, 25, 50]),     np.array([10, 10, 5, 0])
+_EG_XP, _EG_FP = np.array([0, 0.1, 0.2, 1]),    np.array([0, 5, 15, 15])
+_DE_XP, _DE_FP = np.array([0, 50, 100, 300]),   np.array([5, 5, 2.5, 0])
+_RG_XP, _RG_FP = np.array([0, 0.1, 0.5]),       np.array([0, 10, 10])
+
 def compute_score(
     df: pd.DataFrame,
     fundamentals: Dict[str, float],
@@ -121,34 +502,39 @@ def compute_score(
     window = df.iloc[-lookback_days:]
     '''
 
+    # Everything below only reads the tail of these columns
+    arr = {col: df[col].to_numpy() for col in (
+        "Close", "BB_upper", "BB_lower", "SMA_short", "SMA_long", "ATR", "ADX", "OBV",
+        "RSI", "MACD", "MACD_signal",
+    )}
+
     # RSI: mean over lookback
-    rsi_series = df["RSI"].tail(lookback_days).dropna()
-    if not rsi_series.empty:
-        rsi_mean = rsi_series.mean()
+    rsi = arr["RSI"][-lookback_days:]
+    if not np.isnan(rsi).all():
+        rsi_mean = np.nanmean(rsi)
         score   += 15 * (1 - abs(rsi_mean - 50) / 50)
 
     # MACD histogram
-    hist = (df["MACD"] - df["MACD_signal"]).dropna()
+    hist = arr["MACD"] - arr["MACD_signal"]
+    hist = hist[~np.isnan(hist)]
     if len(hist) >= lookback_days:
-        hist_latest = hist.iloc[-1]
-        roll_mean   = hist.abs().rolling(window=lookback_days).mean().dropna()
-        if not roll_mean.empty:
-            avg_hist = roll_mean.iloc[-1]
-            if avg_hist != 0:
-                score += 20 * (hist_latest / avg_hist)
+        hist_latest = hist[-1]
+        avg_hist    = np.abs(hist[-lookback_days:]).mean()
+        if avg_hist != 0:
+            score += 20 * (hist_latest / avg_hist)
 
     # Bollinger position
-    c  = df["Close"].iat[-1]
-    bu = df["BB_upper"].iat[-1]
-    bl = df["BB_lower"].iat[-1]
+    c  = arr["Close"][-1]
+    bu = arr["BB_upper"][-1]
+    bl = arr["BB_lower"][-1]
     if (not np.isnan(bu)) and (not np.isnan(bl)) and (bu > bl):
         frac = (c - bl) / (bu - bl)
         frac = min(max(frac, 0.0), 1.0)
         score += 10 * (1 - frac)
 
     # SMA cross & position
-    sma_s = df["SMA_short"].iat[-1]
-    sma_l = df["SMA_long"].iat[-1]
+    sma_s = arr["SMA_short"][-1]
+    sma_l = arr["SMA_long"][-1]
     # now sma_s and sma_l are numpy floats, so no more ambiguous truth
     if not np.isnan(sma_s):
         score += 5 * ((c / sma_s) - 1)
@@ -158,21 +544,21 @@ def compute_score(
         score += 5 if sma_s > sma_l else -5
 
     # ATR volatility
-    atr = df["ATR"].iat[-1]
+    atr = arr["ATR"][-1]
     if (not np.isnan(atr)) and atr > 0:
         ratio = atr / c
         raw   = (0.04 - ratio) / 0.02
         score += max(0.0, min(1.0, raw)) * 5
 
     # ADX trend strength
-    adx = df["ADX"].iat[-1]
+    adx = arr["ADX"][-1]
     if not np.isnan(adx):
         score += (min(adx, 50) / 50) * 5
 
     # OBV confirmation
     if len(df) >= 2:
-        obv_latest = df["OBV"].iat[-1]
-        obv_prev   = df["OBV"].iat[-2]
+        obv_latest = arr["OBV"][-1]
+        obv_prev   = arr["OBV"][-2]
         if obv_latest > obv_prev:
             score += 5
 
@@ -183,31 +569,57 @@ def compute_score(
     de  = fundamentals.get("debtToEquity")
     rg  = fundamentals.get("revenueQuarterlyGrowth")
 
-    if pe  is not None: fs += np.interp(pe,  [5,15,25,50], [10,10, 5, 0])
-    if eg  is not None: fs += np.interp(eg,  [0,0.1,0.2,1],  [0, 5,15,15])
-    if de  is not None: fs += np.interp(de,  [0,50,100,300],[5, 5,2.5,0])
-    if rg  is not None: fs += np.interp(rg,  [0,0.1,0.5],   [0,10,10])
+    if pe  is not None: fs += np.interp(pe,  _PE_XP, _PE_FP)
+    if eg  is not None: fs += np.interp(eg,  _EG_XP, _EG_FP)
+    if de  is not None: fs += np.interp(de,  _DE_XP, _DE_FP)
+    if rg  is not None: fs += np.interp(rg,  _RG_XP, _RG_FP)
 
     decay = min(lookback_days / 20, 1.0)
     score += fs * decay
 
     return float(np.clip(score, 0, 100))
 
+def history_start(as_of: date, lookback_days: int, params: dict) -> str:
+    """First date of price history needed to score `lookback_days` with `params`."""
+    needed = max(params["sma_long"], params["bb_window"], params["rsi_window"], params["macd_slow"])
+    days   = lookback_days + needed
+    return (as_of - pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+
+def score_from_df(
+    df: pd.DataFrame,
+    fundamentals: Dict[str, float],
+    lookback_days: int,
+    params: dict,
+) -> float:
+    """Score an already-downloaded OHLCV frame, so one download can serve several lookbacks."""
+    df = calculate_indicators(df, **params)
+    return compute_score(df, fundamentals, lookback_days)
+
 def analyze_and_score(
     ticker: str,
-    as_of: datetime,
+    as_of: date,
     lookback_days: int,
     params: dict,
 ) -> float:
-    needed = max(params["sma_long"], params["bb_window"], params["rsi_window"], params["macd_slow"])
-    days   = lookback_days + needed
-    start  = (as_of - pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+    # Only the as-of day matters, so intra-day reruns hit the cache; params
+    # becomes a sorted tuple since dicts can't be lru_cache keys
+    day = as_of.date() if isinstance(as_of, datetime) else as_of
+    return _analyze_and_score(ticker, day, lookback_days, tuple(sorted(params.items())))
+
+@lru_cache(maxsize=4096)
+def _analyze_and_score(
+    ticker: str,
+    as_of: date,
+    lookback_days: int,
+    params: tuple,
+) -> float:
+    params = dict(params)
+    start  = history_start(as_of, lookback_days, params)
     end    = as_of.strftime("%Y-%m-%d")
 
     df   = fetch_data(ticker, start, end)
-    df   = calculate_indicators(df, **params)
     fund = fetch_fundamentals(ticker)
-    return compute_score(df, fund, lookback_days)
+    return score_from_df(df, fund, lookback_days, params)
 
 if __name__ == "__main__":
     import argparse
@@ -221,17 +633,6 @@ if __name__ == "__main__":
     args  = p.parse_args()
     as_of = datetime.strptime(args.as_of, "%Y-%m-%d")
 
-    params5 = {
-        "sma_short": 3,  "sma_long": 5,
-        "bb_window": 5,  "rsi_window": 5,
-        "macd_fast": 3,  "macd_slow": 8, "macd_signal": 3,
-    }
-    params20 = {
-        "sma_short": 10, "sma_long": 20,
-        "bb_window": 20, "rsi_window": 14,
-        "macd_fast": 12, "macd_slow": 26, "macd_signal": 9,
-    }
-
     s5  = analyze_and_score(args.ticker, as_of, lookback_days=5,  params=params5)
     s20 = analyze_and_score(args.ticker, as_of, lookback_days=20, params=params20)
     print(f"5-day score  for {args.ticker} as of {args.as_of}: {s5:.1f}/100")